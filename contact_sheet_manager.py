@@ -1,107 +1,424 @@
 import tkinter as tk
 from tkinter import messagebox  # Add this import
-from PIL import Image, ImageTk
+import PIL
+from PIL import Image, ImageTk, features
 import os
+import argparse
+import hashlib
+import atexit
+import errno
+import shutil
 import logging
+import logging.handlers
 import subprocess
+import collections
+import functools
 import threading
 import queue
+import concurrent.futures
 from tkinterdnd2 import DND_FILES, TkinterDnD
+from image_utils import IMAGE_EXTENSIONS
 
-# Setup logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
+logger = logging.getLogger(__name__)
+
+def setup_logging(debug=False):
+    """Log to console and viewer_debug.log; DEBUG only when requested
+
+    Log calls only put the record on a queue; a QueueListener thread does the
+    formatting and console/file writes so they never block the Tk thread.
+    """
+    root_logger = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root_logger.handlers):
+        return None # Already set up; a second listener would duplicate every record
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
         logging.StreamHandler(),
-        logging.FileHandler('viewer_debug.log')
+        logging.FileHandler('viewer_debug.log', delay=True) # Opened on first record
     ]
-)
-
-def find_custom_screens_folder(base_path):
-    """Find the customScreens_ folder in or below the given path"""
-    logging.info(f"Searching for customScreens_ folder in: {base_path}")
-    for root, dirs, _ in os.walk(base_path):
-        if "customScreens_" in dirs:
-            found_path = os.path.join(root, "customScreens_")
-            logging.info(f"Found customScreens_ folder at: {found_path}")
-            return found_path
-    logging.error("customScreens_ folder not found!")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    root_logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop) # Flush remaining records on exit
+    return listener
+
+# Lowercase extensions, as a set tested against os.path.splitext() output.
+# IMAGE_EXTENSIONS comes from image_utils so both scanners agree.
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mkv', '.avi', '.wmv', '.flv', '.mov'})
+
+# Filter used to shrink screens to the window size. After the draft() and
+# reducing_gap prepasses the remaining ratio is small, where BILINEAR looks
+# the same as LANCZOS on screen at a fraction of the cost (and is what
+# Pillow-SIMD speeds up most). Set LANCZOS for the sharpest result.
+RESAMPLE_FILTER = Image.Resampling.BILINEAR
+# thumbnail() first shrinks by an integer factor with a box filter
+# (Image.reduce) until within this ratio of the target, so RESAMPLE_FILTER
+# only runs over a small buffer. Lower is faster, higher is sharper.
+RESIZE_REDUCING_GAP = 2.0
+
+# Memory budget for shrunk screens kept in memory, in decoded bytes. A
+# budget rather than an entry count, so a large window (or 4K monitor)
+# keeps fewer images instead of using more memory. Entries for earlier
+# window sizes share the budget until they age out.
+IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+# Tk photos of recently shown screens; stepping back to one skips the
+# PIL -> Tk pixel copy. Each holds a full-window RGBA buffer in Tcl.
+PHOTO_CACHE_SIZE = 4
+# Images on each side of the current one decoded ahead of navigation
+PREFETCH_RADIUS = 2
+# Offsets from the current image in decode order: +1, -1, +2, -2, ...
+PREFETCH_ORDER = tuple(sign * distance for distance in range(1, PREFETCH_RADIUS + 1) for sign in (1, -1))
+# Folder (inside the opened folder) that sorted pairs are moved into
+KEEP_FOLDER = 'keep'
+# Target sizes are rounded down to multiples of this many pixels
+SIZE_BUCKET = 16
+# Quiet time after the last window resize event before redrawing
+RESIZE_DEBOUNCE_MS = 150
+# How often the Tk thread collects finished decodes while any are in
+# flight. Polling stops once nothing is pending, so idle cost is zero.
+QUEUE_POLL_MS = 15
+
+MPC_HC_PATH = r"C:\Program Files\MPC-HC\mpc-hc64.exe"
+# Start the player detached from our console and process group, with no
+# inherited handles (e.g. the open log file) or stdio pipes
+if os.name == 'nt':
+    PLAYER_POPEN_FLAGS = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+else:
+    PLAYER_POPEN_FLAGS = 0
+
+def user_cache_dir():
+    """Per-user cache folder: %LOCALAPPDATA% on Windows, else $XDG_CACHE_HOME or ~/.cache"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'contact_sheet_manager')
+
+# Shrunk screens kept between runs. Outside the opened folder, so sorting
+# into keep/ and the empty-directory cleanup never see it; cache keys hold
+# the full image path, so one folder serves every opened tree. Deleting the
+# folder is always safe and just clears the cache.
+THUMBNAIL_CACHE_DIR = os.path.join(user_cache_dir(), 'thumbnails')
+# Disk budget for THUMBNAIL_CACHE_DIR; the oldest files are removed at
+# startup until the cache fits
+THUMBNAIL_CACHE_BYTES = 512 * 1024 * 1024
+
+def log_imaging_backend():
+    """Log the Pillow build in use and warn when SIMD resizing is unavailable"""
+    is_simd = '.post' in PIL.__version__  # Pillow-SIMD versions end in .postN
+    logger.info("Pillow %s, libjpeg-turbo: %s", PIL.__version__, features.check_feature('libjpeg_turbo'))
+    if not is_simd:
+        logger.warning("Pillow-SIMD not detected, falling back to scalar resize kernels")
+    return is_simd
+
+def open_draft(image_path, width, height):
+    """Open an image, letting the JPEG decoder shrink it while decoding
+
+    draft() picks the smallest libjpeg scale (1/2, 1/4 or 1/8) that still
+    covers width x height, so a large sheet shown in a small window decodes
+    up to 64x fewer pixels. Formats without reduced decoding are opened
+    unchanged.
+    """
+    img = Image.open(image_path)
+    if img.draft('RGB', (width, height)) is not None:
+        logger.debug("Draft decoding %s at %s", image_path, img.size)
+    return img
+
+# Modes ImageTk.PhotoImage can copy straight into a Tk photo block
+PHOTO_MODES = ('1', 'L', 'RGB', 'RGBA')
+
+def to_photo_mode(img):
+    """Convert img to a mode Tk can take without further conversion
+
+    ImageTk.PhotoImage converts any other mode (palette, CMYK, LA, ...) on
+    the Tk main thread. Doing it here, in the decoding worker, leaves the
+    main thread only the raw block copy.
+    """
+    if img.mode in PHOTO_MODES:
+        return img
+    if img.mode in ('LA', 'PA') or 'transparency' in img.info:
+        return img.convert('RGBA')
+    return img.convert('RGB')
+
+def prepare_image(image_path, target_dims, cache_dir):
+    """Open image file and shrink it to fit target dimensions.
+
+    A copy shrunk on an earlier run is read from the thumbnail cache when
+    present. Otherwise JPEGs are decoded at a reduced DCT scale (see
+    open_draft) so the full-resolution raster is never materialised.
+
+    Runs in the decoding pool. It only touches its arguments and the
+    filesystem, so it is safe to call from any thread (or process).
+    """
+    try:
+        target_width, target_height = target_dims
+        if target_width <= 0 or target_height <= 0:
+            logger.error("Invalid target dimensions: %dx%d", target_width, target_height)
+            return None
+
+        # Images are fully loaded inside each with-block, so the file is
+        # closed on return (or error) and the pixels stay usable
+        cache_path = thumbnail_cache_path(image_path, target_dims, cache_dir)
+        try:
+            with Image.open(cache_path) as img:
+                img.load()
+            return img
+        except FileNotFoundError:
+            pass # Not cached yet
+        except Exception as e:
+            logger.warning("Ignoring unreadable cached thumbnail %s: %s", cache_path, e)
+
+        with open_draft(image_path, target_width, target_height) as src:
+            img = resize_image(src, target_dims)
+            if img is not None:
+                # thumbnail() returns without decoding screens that already
+                # fit; decode here rather than lazily on the Tk thread
+                img.load()
+                img = to_photo_mode(img)
+        # Screens smaller than the window are cheap to decode; only cache
+        # those that had to be shrunk to fit
+        if img is not None and (img.width == target_width or img.height == target_height):
+            save_thumbnail(img, cache_path)
+        return img
+
+    except Exception as e:
+        logger.error("Error opening image %s: %s", image_path, e, exc_info=True)
+        return None
+
+def thumbnail_cache_path(image_path, target_dims, cache_dir):
+    """Return the thumbnail cache file for image_path shrunk to target_dims.
+
+    The key covers modification time and size, so replaced screens are
+    never served stale, and the resample filter, so changing
+    RESAMPLE_FILTER rebuilds the cache.
+    """
+    stat = os.stat(image_path)
+    key = f"{image_path}|{stat.st_mtime_ns}|{stat.st_size}|{target_dims[0]}x{target_dims[1]}|{RESAMPLE_FILTER.name}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, digest + '.jpg')
+
+def save_thumbnail(img, cache_path):
+    """Write a shrunk image to the thumbnail cache; failure only costs a re-decode."""
+    if img.mode not in ('RGB', 'L'):
+        return # JPEG can't hold alpha/palette images; decode those each run
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        img.save(tmp_path, 'JPEG', quality=85)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not write thumbnail cache %s: %s", cache_path, e)
+
+def prune_thumbnail_cache(cache_dir, max_bytes):
+    """Delete the oldest thumbnail cache files until the rest fit in max_bytes"""
+    try:
+        with os.scandir(cache_dir) as it:
+            entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in it if e.is_file()]
+    except FileNotFoundError:
+        return # Nothing cached yet
+    except OSError as e:
+        logger.warning("Could not scan thumbnail cache %s: %s", cache_dir, e)
+        return
+
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    entries.sort() # Oldest first
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue # In use or already gone; try the next one
+        total -= size
+        removed += 1
+    logger.info("Pruned %d thumbnail cache files, %d bytes left", removed, total)
+
+def resize_image(img, target_dims):
+    """Resize PIL image in place to fit target dimensions."""
+    try:
+        target_width, target_height = target_dims
+        logger.debug("Preparing image with target dimensions: %dx%d", target_width, target_height)
+
+        if target_width <= 0 or target_height <= 0:
+            logger.error("Invalid target dimensions: %dx%d", target_width, target_height)
+            return None
+
+        img.thumbnail((target_width, target_height), RESAMPLE_FILTER, reducing_gap=RESIZE_REDUCING_GAP)
+        logger.debug("Resized image to: %s", img.size)
+        return img
+
+    except Exception as e:
+        logger.error("Error preparing image: %s", e, exc_info=True)
+        return None
+
+def image_nbytes(img):
+    """Approximate decoded size of a PIL image (one byte per band per pixel)"""
+    return img.width * img.height * len(img.getbands())
+
+def bucket_dimensions(width, height):
+    """Round a target size down to SIZE_BUCKET steps
+
+    Both image caches and the thumbnail cache are keyed by target size, so
+    nudging the window by a few pixels maps to the same key instead of
+    decoding again. Rounding down keeps the image inside the window.
+    """
+    return (max(SIZE_BUCKET, width - width % SIZE_BUCKET),
+            max(SIZE_BUCKET, height - height % SIZE_BUCKET))
+
+@functools.lru_cache(maxsize=4096)
+def file_name(path):
+    """os.path.basename, memoised; the same few paths are shown on every scroll"""
+    return os.path.basename(path)
+
+def move_file(src, dst):
+    """Move src to dst, renaming in place whenever possible
+
+    os.replace is a single atomic rename but fails with EXDEV when dst is on
+    another filesystem (e.g. keep/ on a different mount); only then fall
+    back to shutil.move, which copies and deletes. Both would silently
+    overwrite an existing dst, so that raises FileExistsError instead.
+    """
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "Destination already exists", dst)
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        logger.info("Cross-device move, copying: %s -> %s", src, dst)
+        shutil.move(src, dst)
+
+def find_custom_screens_folder(base_path, max_depth=None):
+    """Find the customScreens_ folder in or below the given path
+
+    Breadth-first over os.scandir so the shallowest match is returned without
+    walking the rest of the tree. DirEntry.is_dir() uses the type cached from
+    the directory read, so no extra stat calls are made. max_depth limits how
+    many levels below base_path are searched (None for no limit).
+    """
+    logger.info("Searching for customScreens_ folder in: %s", base_path)
+    # Usual layout: screens sit right next to the videos. One stat settles
+    # it without listing base_path at all
+    direct = os.path.join(base_path, "customScreens_")
+    if os.path.isdir(direct):
+        logger.info("Found customScreens_ folder at: %s", direct)
+        return direct
+
+    pending = collections.deque([(base_path, 0)])
+    while pending:
+        dir_path, depth = pending.popleft()
+        try:
+            with os.scandir(dir_path) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.name == "customScreens_" and entry.is_dir():
+                        logger.info("Found customScreens_ folder at: %s", entry.path)
+                        return entry.path
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+        except OSError as e:
+            logger.warning("Cannot scan %s: %s", dir_path, e)
+            continue
+        if max_depth is None or depth < max_depth:
+            pending.extend((path, depth + 1) for path in subdirs)
+    logger.error("customScreens_ folder not found!")
     return None
 
 def get_matching_files(video_path, screens_path):
     """Match video files with their corresponding screen captures"""
-    logging.info(f"Matching files between:\nVideos: {video_path}\nScreens: {screens_path}")
-    
-    video_extensions = ('.mp4', '.mkv', '.avi', '.wmv', '.flv', '.mov')
-    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+    logger.info("Matching files between:\nVideos: %s\nScreens: %s", video_path, screens_path)
     
-    # Log all files in directories
+    # List both directories once; DirEntry.is_file() uses the cached type
     try:
-        video_files = os.listdir(video_path)
-        screen_files = os.listdir(screens_path)
-        logging.debug(f"Found {len(video_files)} files in video directory:")
-        for f in video_files:
-            logging.debug(f"  Video dir: {f}")
-        logging.debug(f"Found {len(screen_files)} files in screens directory:")
-        for f in screen_files:
-            logging.debug(f"  Screen dir: {f}")
+        with os.scandir(video_path) as entries:
+            video_files = [e.name for e in entries if e.is_file()]
+        with os.scandir(screens_path) as entries:
+            screen_files = [e.name for e in entries if e.is_file()]
+        # One summary line per directory; formatting is deferred to the handler
+        logger.debug("Found %d files in video directory: %s", len(video_files), video_files)
+        logger.debug("Found %d files in screens directory: %s", len(screen_files), screen_files)
     except Exception as e:
-        logging.error(f"Error reading directories: {e}")
+        logger.error("Error reading directories: %s", e)
         return []
     
-    # Get all video files
-    videos = []
-    for f in video_files:
-        if any(f.lower().endswith(ext) for ext in video_extensions):
-            videos.append(f)
-            logging.debug(f"Found video file: {f}")
+    # Index screens by the video name they belong to (the screen name minus
+    # its image extension, lowercased) so each video is a single dict probe.
+    # When one video has several screens, the earliest IMAGE_EXTENSIONS entry
+    # wins, as it did when extensions were probed in order.
+    ext_rank = {ext: rank for rank, ext in enumerate(IMAGE_EXTENSIONS)}
+    screen_index = {}
+    for f in screen_files:
+        stem, ext = os.path.splitext(f)
+        rank = ext_rank.get(ext.lower())
+        if rank is None:
+            continue
+        key = stem.lower()
+        current = screen_index.get(key)
+        if current is None or rank < current[0]:
+            screen_index[key] = (rank, f)
+
+    # Get all video files, sorted once so the pairs come out in order
+    videos = sorted(f for f in video_files
+                    if os.path.splitext(f)[1].lower() in VIDEO_EXTENSIONS)
     
     if not videos:
-        logging.warning(f"No video files found with extensions: {video_extensions}")
+        logger.warning("No video files found with extensions: %s", ', '.join(sorted(VIDEO_EXTENSIONS)))
     
+    # Per-video messages are only built when DEBUG is enabled
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     # Match with screenshots - now looking for full filename + image extension
     matched_files = []
     for video in videos:
-        logging.debug(f"Looking for matches for video: {video}")
-        
-        # Look for video filename + image extension
-        matched = False
-        for img_ext in image_extensions:
-            img_name = video + img_ext  # Use full video filename including extension
-            img_path = os.path.join(screens_path, img_name)
-            logging.debug(f"Checking for image: {img_name}")
-            if os.path.exists(img_path):
-                matched = True
-                matched_files.append((
-                    os.path.join(video_path, video),
-                    img_path
-                ))
-                logging.debug(f"Found match: {img_name}")
-                break
-        
-        if not matched:
-            logging.warning(f"No matching image found for video: {video}")
+        # Screens are named after the full video filename including extension
+        hit = screen_index.get(video.lower())
+        if hit is None:
+            logger.warning("No matching image found for video: %s", video)
+            continue
+        img_name = hit[1]
+        matched_files.append((
+            os.path.join(video_path, video),
+            os.path.join(screens_path, img_name)
+        ))
+        if debug:
+            logger.debug("Matched: %s -> %s", video, img_name)
     
-    logging.info(f"Found {len(matched_files)} matching video-screenshot pairs")
-    for video, screen in matched_files:
-        logging.info(f"Matched: {os.path.basename(video)} -> {os.path.basename(screen)}")
+    logger.info("Found %d matching video-screenshot pairs", len(matched_files))
     
-    return sorted(matched_files)
+    return matched_files
 
 class ImageViewer:
     def __init__(self, root, folder_path):
-        logging.info("Initializing ImageViewer")
+        logger.info("Initializing ImageViewer")
         self.root = root
         self.current_index = 0
-        # self.photos = []      # Store all processed images - Replaced by loaded_images
-        self.loaded_images = {} # Store loaded PIL images {index: pil_image}
-        self.image_queue = queue.Queue() # Queue for background loading
-        self.loading_thread = None
+        self.image_cache = collections.OrderedDict() # LRU of shrunk PIL images {(image_path, target_dims): pil_image}
+        self.image_cache_bytes = 0 # Decoded size of everything in image_cache
+        self.photo_cache = collections.OrderedDict() # LRU of (Tk photo, PIL mode) pairs, same keys as image_cache
+        self.image_queue = queue.Queue() # Decoded ((image_path, target_dims), pil_image) results from the pool
+        self.pending = {} # Decodes in flight {(image_path, target_dims): future}
+        self.queue_job = None # after() id of the scheduled _process_queue call
+        self.resize_job = None # after() id of the pending _apply_resize call
+        self.resize_dimensions = None # Target size from the latest resize event
+        self.window_size = None # (width, height) of the last Configure event handled
+        # Pillow releases the GIL while decoding and resampling, so decodes
+        # run in parallel across cores
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
         self.target_dimensions = (800, 600) # Default/initial dimensions
         self.file_pairs = []  # Store (video_path, image_path) pairs
         self.base_path = folder_path  # Store base path for folder creation
-        self.keep_folder = os.path.join(folder_path, 'keep')  # Just store path, don't create yet
+        self.keep_folder = os.path.join(folder_path, KEEP_FOLDER)  # Just store path, don't create yet
+        self.destination_folders = {}  # {dest_key: (main_folder, screens_folder)} already created
+        self.thumbnail_cache_dir = THUMBNAIL_CACHE_DIR  # Created on first save
 
         # Add space key state and moved files tracking
         self.space_pressed = False
@@ -126,9 +443,14 @@ class ImageViewer:
         content_frame.grid_rowconfigure(0, weight=1)
         content_frame.grid_columnconfigure(0, weight=1)
         
-        # Create UI in content frame instead of root
-        self.label = tk.Label(content_frame, bg='black')
-        self.label.grid(row=0, column=0, sticky='nsew')
+        # Create UI in content frame instead of root. A canvas item only
+        # swaps its photo on navigation, where a Label would recompute its
+        # geometry and redraw the whole widget
+        self.canvas = tk.Canvas(content_frame, bg='black', highlightthickness=0, bd=0)
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+        self.image_item = self.canvas.create_image(0, 0, anchor='center')
+        self.canvas.image = None # Photo currently shown; keeps it alive
+        self.canvas.bind('<Configure>', self.on_canvas_resize)
 
         # Add file info display at bottom of root
         self.info_label = tk.Label(
@@ -172,33 +494,70 @@ class ImageViewer:
         # Find customScreens_ folder and load images
         screens_folder = find_custom_screens_folder(folder_path)
         if screens_folder:
-            logging.info("Starting image loading process")
+            logger.info("Starting image loading process")
             self.load_all_images(folder_path, screens_folder)
         else:
-            logging.error("No customScreens_ folder found, cannot proceed")
+            logger.error("No customScreens_ folder found, cannot proceed")
             self.loading_label.configure(text="Error: customScreens_ folder not found")
             self.loading_label.grid() # Show error
 
     def on_resize(self, event):
-        """Handle window resize event."""
-        # Update target dimensions based on new window size
+        """Handle window resize event; the redraw waits until resizing settles."""
+        # The binding on the toplevel also receives every child widget's
+        # Configure events; only the window's own size matters here
+        if event.widget is not self.root:
+            return
+        # Moving the window fires Configure too; only a new size matters
+        if (event.width, event.height) == self.window_size:
+            return
+        self.window_size = (event.width, event.height)
         # Subtract padding/margins as needed
         width = event.width - 40
         height = event.height - 60 # Account for info label
-        if width > 0 and height > 0:
-            self.target_dimensions = (width, height)
-            logging.debug(f"Window resized, new target dimensions: {self.target_dimensions}")
-            # Re-display the current image to resize it
-            if self.file_pairs: # Only if images are loaded/loading
-                 # Clear the current PhotoImage cache for the index
-                if self.current_index in self.loaded_images and isinstance(self.loaded_images[self.current_index], ImageTk.PhotoImage):
-                    self.loaded_images[self.current_index] = self.loaded_images[self.current_index].pil_image # Revert to PIL image
-                self.show_image(self.current_index, force_update=True)
-
+        if width <= 0 or height <= 0:
+            return
+        width, height = bucket_dimensions(width, height)
+
+        if self.resize_job:
+            self.root.after_cancel(self.resize_job)
+            self.resize_job = None
+        if (width, height) != self.target_dimensions:
+            # Dragging a window edge fires many events; only decode and
+            # redraw once no new size has arrived for RESIZE_DEBOUNCE_MS
+            self.resize_dimensions = (width, height)
+            self.resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self._apply_resize)
+
+    def on_canvas_resize(self, event):
+        """Keep the image centred in the canvas."""
+        self.canvas.coords(self.image_item, event.width // 2, event.height // 2)
+
+    def _apply_resize(self):
+        """Switch to the size recorded by the last resize event and redraw."""
+        self.resize_job = None
+        self.target_dimensions = self.resize_dimensions
+        logger.debug("Window resized, new target dimensions: %s", self.target_dimensions)
+        # The cache is keyed by size, so lookups at the new size simply
+        # miss and entries for the old size age out of the LRU
+        # Re-display the current image to resize it
+        if self.file_pairs:
+            self.show_image(self.current_index)
+
+    def set_photo(self, photo):
+        """Show photo on the canvas, or clear it when photo is None."""
+        self.canvas.itemconfig(self.image_item, image=photo if photo is not None else '')
+        self.canvas.image = photo # Keep reference
 
     def confirm_exit(self, event=None):
         """Show confirmation dialog before returning to folder selection"""
-        if tk.messagebox.askyesno("Confirm", "Return to folder selection?"):
+        if messagebox.askyesno("Confirm", "Return to folder selection?"):
+            # Stop decoding; results still in flight are discarded
+            if self.queue_job:
+                self.root.after_cancel(self.queue_job)
+                self.queue_job = None
+            if self.resize_job:
+                self.root.after_cancel(self.resize_job)
+                self.resize_job = None
+            self.pool.shutdown(wait=False, cancel_futures=True)
             # Show selector window
             if self.selector:
                 self.selector.root.deiconify()
@@ -206,13 +565,13 @@ class ImageViewer:
             self.root.destroy()
 
     def load_all_images(self, video_path, screens_path):
-        """Load and process all matching images"""
+        """Match files and show the first image; the rest are decoded on demand"""
         self.file_pairs = get_matching_files(video_path, screens_path)
         total = len(self.file_pairs)
-        logging.info(f"Found {total} matching file pairs.")
+        logger.info("Found %d matching file pairs.", total)
 
         if not self.file_pairs:
-            logging.error("No matching files found!")
+            logger.error("No matching files found!")
             self.loading_label.configure(text="Error: No matching video/image files found.")
             self.loading_label.grid()
             return
@@ -223,174 +582,187 @@ class ImageViewer:
         height = self.root.winfo_height() - 60
         if width <= 0 or height <= 0:
              width, height = 800, 600 # Fallback dimensions
-             logging.warning(f"Using fallback dimensions: {width}x{height}")
-        self.target_dimensions = (width, height)
-        logging.info(f"Initial target dimensions for loading: {self.target_dimensions}")
-
-        # Show loading indicator
-        self.loading_label.configure(text=f"Loading 0/{total} images...")
-        self.loading_label.grid()
-
-        # Start background loading thread
-        self.loading_thread = threading.Thread(
-            target=self._background_load_images,
-            args=(list(self.file_pairs), self.image_queue, self.target_dimensions), # Pass a copy
-            daemon=True
-        )
-        self.loading_thread.start()
+             logger.warning("Using fallback dimensions: %dx%d", width, height)
+        self.target_dimensions = bucket_dimensions(width, height)
+        logger.info("Initial target dimensions for loading: %s", self.target_dimensions)
 
-        # Start processing the queue
-        self.root.after(100, self._process_queue) # Check queue every 100ms
+        self.show_image(0)
 
-    def _background_load_images(self, file_pairs_copy, q, target_dims):
-        """Load images in a background thread."""
-        logging.info(f"[Thread] Starting background image loading for {len(file_pairs_copy)} images.")
-        for i, (video_path, image_path) in enumerate(file_pairs_copy):
-            try:
-                logging.debug(f"[Thread] Loading image {i}: {image_path}")
-                img = Image.open(image_path)
-                resized_img = self.prepare_image(img, target_dims)
-                if resized_img:
-                    q.put((i, resized_img)) # Put index and PIL image on queue
-                    logging.debug(f"[Thread] Queued image {i}")
-                else:
-                     logging.error(f"[Thread] Failed to prepare image {i}: {image_path}")
+    def request_image(self, index):
+        """Decode the image at index in the pool unless cached (as PIL image or Tk photo) or already pending."""
+        if not (0 <= index < len(self.file_pairs)):
+            return
+        image_path = self.file_pairs[index][1]
+        target_dims = self.target_dimensions
+        key = (image_path, target_dims)
+        if key in self.image_cache or key in self.photo_cache or key in self.pending:
+            return
 
-            except Exception as e:
-                logging.error(f"[Thread] Error loading {image_path}: {e}", exc_info=True)
-        q.put(None) # Signal completion
-        logging.info("[Thread] Background image loading finished.")
+        future = self.pool.submit(prepare_image, image_path, target_dims, self.thumbnail_cache_dir)
+        self.pending[key] = future
+        future.add_done_callback(lambda f: self._on_decoded(key, f))
+        if self.queue_job is None:
+            self.queue_job = self.root.after(QUEUE_POLL_MS, self._process_queue)
+
+    def _on_decoded(self, key, future):
+        """Hand a finished decode back to the main thread (runs in a pool thread)."""
+        if future.cancelled():
+            return # Dropped by cancel_stale_decodes or on exit
+        self.image_queue.put((key, future.result()))
+
+    def cancel_stale_decodes(self, index):
+        """Cancel queued decodes outside the prefetch window around index.
+
+        Only decodes that haven't started can be cancelled; running ones
+        finish and land in the cache as usual.
+        """
+        window = self.file_pairs[max(0, index - PREFETCH_RADIUS):index + PREFETCH_RADIUS + 1]
+        wanted = {(image_path, self.target_dimensions) for _, image_path in window}
+        for key, future in list(self.pending.items()):
+            if key not in wanted and future.cancel():
+                del self.pending[key]
+                logger.debug("Cancelled stale decode: %s at %s", *key)
 
     def _process_queue(self):
-        """Process images from the background queue in the main thread."""
+        """Move decoded images from the pool into the cache in the main thread."""
+        self.queue_job = None
+        current_key = (self.file_pairs[self.current_index][1], self.target_dimensions) if self.file_pairs else None
         try:
-            while not self.image_queue.empty():
-                item = self.image_queue.get_nowait()
-                if item is None:
-                    # Loading finished
-                    logging.info("Finished processing image queue.")
-                    self.loading_label.grid_remove()
-                    if not self.loaded_images:
-                         logging.error("No images were successfully loaded!")
-                         self.info_label.configure(text="Error: Failed to load any images.")
-                    elif 0 not in self.loaded_images:
-                         logging.warning("First image (index 0) not loaded yet, waiting...")
-                         # It might still be in the queue, check again soon
-                         self.root.after(50, self._process_queue)
-                         return # Don't stop checking yet
-                    else:
-                         # Ensure first image is shown if loading finished quickly
-                         if self.label.image is None:
-                              self.show_image(0)
-                    return # Stop checking
-
-                index, pil_image = item
-                logging.debug(f"Processing queued image index {index}")
-                self.loaded_images[index] = pil_image # Store PIL image
-
-                # Update loading label
-                total = len(self.file_pairs)
-                loaded_count = len(self.loaded_images)
-                self.loading_label.configure(text=f"Loading {loaded_count}/{total} images...")
-
-                # Show the first image as soon as it's ready
-                if index == 0 and self.label.image is None:
-                    logging.info("First image loaded, displaying.")
-                    self.show_image(0)
+            while True:
+                key, pil_image = self.image_queue.get_nowait()
+                self.pending.pop(key, None)
+                image_path, target_dims = key
+                if target_dims != self.target_dimensions:
+                    # Decoded for a window size no longer in use
+                    logger.debug("Discarding image decoded at %s: %s", target_dims, image_path)
+                    if pil_image is not None:
+                        pil_image.close()
+                    continue
+                if pil_image is None:
+                    logger.error("Failed to prepare image: %s", image_path)
+                    if key == current_key:
+                        self.info_label.configure(text=f"Error loading image {self.current_index+1}")
+                    continue
+
+                self.cache_image(key, pil_image)
+
+                # Show the current image as soon as it's ready
+                if key == current_key:
+                    self.show_image(self.current_index)
 
         except queue.Empty:
             pass # Queue is empty, check again later
         except Exception as e:
-            logging.error(f"Error processing image queue: {e}", exc_info=True)
-
-        # Schedule next check if loading is not finished
-        if self.loading_thread and self.loading_thread.is_alive() or not self.image_queue.empty():
-             self.root.after(100, self._process_queue)
-
-
-    def prepare_image(self, img, target_dims):
-        """Resize PIL image to fit target dimensions."""
-        try:
-            target_width, target_height = target_dims
-            logging.debug(f"Preparing image with target dimensions: {target_width}x{target_height}")
-
-            if target_width <= 0 or target_height <= 0:
-                logging.error(f"Invalid target dimensions: {target_width}x{target_height}")
-                return None
-
-            img.thumbnail((target_width, target_height), Image.Resampling.LANCZOS)
-            logging.debug(f"Resized image to: {img.size}")
-            return img
-
-        except Exception as e:
-            logging.error(f"Error preparing image: {e}", exc_info=True)
-            return None
-
-    def show_image(self, index, force_update=False):
-        """Display image and file info at given index from loaded_images."""
-        logging.debug(f"Attempting to show image at index: {index}")
+            logger.error("Error processing image queue: %s", e, exc_info=True)
+
+        # Keep checking while decodes are in flight
+        if self.pending and self.queue_job is None:
+            self.queue_job = self.root.after(QUEUE_POLL_MS, self._process_queue)
+
+    def cache_image(self, key, pil_image):
+        """Add a decoded image to image_cache, evicting LRU entries over IMAGE_CACHE_BYTES."""
+        self.image_cache[key] = pil_image
+        self.image_cache_bytes += image_nbytes(pil_image)
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.image_cache_bytes > IMAGE_CACHE_BYTES and len(self.image_cache) > 1:
+            evicted_key = next(iter(self.image_cache)) # Least recently used
+            self.uncache_image(evicted_key)
+            logger.debug("Evicted cached image: %s at %s", *evicted_key)
+
+    def uncache_image(self, key):
+        """Drop key from image_cache and free its raster now rather than at GC."""
+        pil_image = self.image_cache.pop(key)
+        self.image_cache_bytes -= image_nbytes(pil_image)
+        pil_image.close()
+
+    def show_image(self, index):
+        """Display image and file info at given index, queueing a decode if needed."""
+        logger.debug("Attempting to show image at index: %d", index)
 
         # Check if file_pairs is populated
         if not self.file_pairs:
-            logging.warning("show_image called before file_pairs are loaded.")
-            self.label.configure(image='')
+            logger.warning("show_image called before file_pairs are loaded.")
+            self.set_photo(None)
             self.info_label.configure(text="Loading file list...")
             return
 
         if not (0 <= index < len(self.file_pairs)):
-            logging.error(f"Invalid image index: {index} for {len(self.file_pairs)} files")
+            logger.error("Invalid image index: %d for %d files", index, len(self.file_pairs))
             return # Invalid index
 
         self.current_index = index
         video_path, image_path = self.file_pairs[index]
-
-        # Check if image is loaded
-        loaded_item = self.loaded_images.get(index)
-
-        if loaded_item is None:
-            logging.warning(f"Image {index} not loaded yet.")
-            # Optionally show a placeholder/loading text on the label
-            self.label.configure(image='') # Clear previous image
-            self.label.image = None
-            self.info_label.configure(text=f"Loading image {index+1}...\nVideo: {os.path.basename(video_path)}\nScreen: {os.path.basename(image_path)}")
-            return
-
+        # Free pool workers for the images around the new position
+        self.cancel_stale_decodes(index)
+
+        key = (image_path, self.target_dimensions)
+        pil_image = self.image_cache.get(key)
+        if pil_image is None and key not in self.photo_cache:
+            logger.debug("Image %d not loaded yet.", index)
+            self.request_image(index)
+            self.set_photo(None) # Clear previous image
+            self.info_label.configure(text=f"Loading image {index+1}...\nVideo: {file_name(video_path)}\nScreen: {file_name(image_path)}")
+        else:
+            if pil_image is not None:
+                self.image_cache.move_to_end(key)
+            self.display_image(index, pil_image)
+
+        # Decode the neighbours in the background so scrolling is instant.
+        # The pool runs jobs in submission order, so submit nearest first
+        # (next before previous, the usual scroll direction)
+        for offset in PREFETCH_ORDER:
+            self.request_image(index + offset)
+
+    def display_image(self, index, pil_image):
+        """Put a decoded image and its file info on screen.
+
+        The Tk photo is reused from photo_cache when present; pil_image is
+        only converted (and may be None) otherwise.
+        """
+        video_path, image_path = self.file_pairs[index]
+        key = (image_path, self.target_dimensions)
         try:
-            # If it's already a PhotoImage and we don't force update, use it
-            if isinstance(loaded_item, ImageTk.PhotoImage) and not force_update:
-                 photo = loaded_item
-                 logging.debug(f"Using cached PhotoImage for index {index}")
+            entry = self.photo_cache.get(key)
+            if entry is None:
+                photo = self.new_photo(pil_image)
+                self.photo_cache[key] = (photo, pil_image.mode)
             else:
-                 # It's a PIL image, or we need to force update (resize)
-                 pil_image = loaded_item if not isinstance(loaded_item, ImageTk.PhotoImage) else loaded_item.pil_image
-                 # Resize based on current target dimensions
-                 resized_pil_image = self.prepare_image(pil_image.copy(), self.target_dimensions) # Use copy
-                 if not resized_pil_image:
-                      raise ValueError("Failed to resize PIL image")
-
-                 photo = ImageTk.PhotoImage(resized_pil_image)
-                 photo.pil_image = resized_pil_image # Keep reference to PIL image if needed later
-                 self.loaded_images[index] = photo # Cache the PhotoImage
-                 logging.debug(f"Created and cached PhotoImage for index {index} with size {resized_pil_image.size}")
-
-            self.label.configure(image=photo)
-            self.label.image = photo # Keep reference
+                photo = entry[0]
+                self.photo_cache.move_to_end(key)
+            self.set_photo(photo)
+            logger.debug("Displayed image %d with size %dx%d", index, photo.width(), photo.height())
 
             # Update file info
-            video_name = os.path.basename(video_path)
-            image_name = os.path.basename(image_path)
-            logging.debug(f"Showing file info for: {video_name} -> {image_name}")
+            video_name = file_name(video_path)
+            image_name = file_name(image_path)
+            logger.debug("Showing file info for: %s -> %s", video_name, image_name)
             self.info_label.configure(
                 text=f"Video: {video_name}\nScreen: {image_name}"
             )
 
         except Exception as e:
-             logging.error(f"Error displaying image {index}: {e}", exc_info=True)
-             self.label.configure(image='')
-             self.label.image = None
+             logger.error("Error displaying image %d: %s", index, e, exc_info=True)
+             self.set_photo(None)
              self.info_label.configure(text=f"Error loading image {index+1}")
 
 
+    def new_photo(self, pil_image):
+        """Return a Tk photo holding pil_image, making room in photo_cache.
+
+        Screens of one folder usually shrink to the same size, so the photo
+        evicted from the cache is refilled with paste() instead of freeing
+        one Tk image and allocating another. paste() converts to the mode
+        the photo was created with, so the size and mode must both match.
+        """
+        if len(self.photo_cache) >= PHOTO_CACHE_SIZE:
+            _, (oldest, mode) = self.photo_cache.popitem(last=False)
+            # Never overwrite the photo on screen
+            if (oldest is not self.canvas.image and mode == pil_image.mode
+                    and (oldest.width(), oldest.height()) == pil_image.size):
+                oldest.paste(pil_image)
+                return oldest
+        return ImageTk.PhotoImage(pil_image)
+
     def on_mouse_wheel(self, event):
         """Handle mouse wheel navigation"""
         if not self.file_pairs: # Check file_pairs instead of photos
@@ -407,31 +779,25 @@ class ImageViewer:
 
     def verify_file_pair(self, video_path, image_path):
         """Verify that image filename matches video filename"""
-        video_name = os.path.basename(video_path)
-        image_name = os.path.basename(image_path)
+        video_name = file_name(video_path)
+        image_name = file_name(image_path)
         
-        # Image name should be video name + image extension
-        return image_name.startswith(video_name)
+        # Image name should be video name + image extension; pairing ignores
+        # case, so c.avi and C.AVI.jpg are a valid pair
+        return image_name.lower().startswith(video_name.lower())
 
     def create_destination_folders(self, dest_key):
         """Create keep folder and destination folders only when needed"""
-        # Create keep folder if it doesn't exist
-        if not os.path.exists(self.keep_folder):
-            logging.info(f"Creating keep folder at: {self.keep_folder}")
-            os.makedirs(self.keep_folder)
-        
-        main_folder = os.path.join(self.keep_folder, dest_key)
-        screens_folder = os.path.join(main_folder, 'customScreens_')
-        
-        if not os.path.exists(main_folder):
-            logging.info(f"Creating {dest_key} folder at: {main_folder}")
-            os.makedirs(main_folder)
-        
-        if not os.path.exists(screens_folder):
-            logging.info(f"Creating customScreens_ folder at: {screens_folder}")
-            os.makedirs(screens_folder)
-            
-        return main_folder, screens_folder
+        folders = self.destination_folders.get(dest_key)
+        if folders is None:
+            main_folder = os.path.join(self.keep_folder, dest_key)
+            screens_folder = os.path.join(main_folder, 'customScreens_')
+            # One makedirs call creates keep/, keep/<dest_key>/ and customScreens_
+            logger.info("Ensuring %s folders at: %s", dest_key, main_folder)
+            os.makedirs(screens_folder, exist_ok=True)
+            # Remember them so later moves to this destination skip the syscalls
+            folders = self.destination_folders[dest_key] = (main_folder, screens_folder)
+        return folders
 
     def space_pressed_handler(self, event):
         """Handle space key press"""
@@ -452,37 +818,44 @@ class ImageViewer:
                 
                 moved_count = 0
                 failed_count = 0
+
+                # Same destination for the whole batch; create it once up front
+                main_folder, screens_folder = self.create_destination_folders(dest_key)
                 
-                for idx in range(start_idx, end_idx):
-                    video_path, image_path = self.file_pairs[idx]
-                    
+                # Bind what the loop uses as locals; a long space-held batch
+                # can cover hundreds of pairs
+                moved_files = self.moved_files
+                verify_file_pair = self.verify_file_pair
+                join = os.path.join
+
+                for video_path, image_path in self.file_pairs[start_idx:end_idx]:
                     # Skip if file was already moved
-                    if video_path in self.moved_files:
+                    if video_path in moved_files:
                         continue
                         
                     # Verify filename match
-                    if not self.verify_file_pair(video_path, image_path):
-                        logging.error(f"Filename mismatch: {video_path} -> {image_path}")
+                    if not verify_file_pair(video_path, image_path):
+                        logger.error("Filename mismatch: %s -> %s", video_path, image_path)
                         failed_count += 1
                         continue
                     
-                    # Create destination folders only when needed
-                    main_folder, screens_folder = self.create_destination_folders(dest_key)
-                    
                     # Move files to appropriate folders
-                    video_name = os.path.basename(video_path)
-                    image_name = os.path.basename(image_path)
-                    
-                    video_dest = os.path.join(main_folder, video_name)
-                    image_dest = os.path.join(screens_folder, image_name)
+                    video_dest = join(main_folder, file_name(video_path))
+                    image_dest = join(screens_folder, file_name(image_path))
+
+                    # Check both before moving either, so a pair is never split
+                    if os.path.lexists(video_dest) or os.path.lexists(image_dest):
+                        logger.error("Destination already exists: %s -> %s", video_dest, image_dest)
+                        failed_count += 1
+                        continue
                     
-                    logging.info(f"Moving files to {dest_key}:\nVideo -> {video_dest}\nImage -> {image_dest}")
+                    logger.info("Moving files to %s:\nVideo -> %s\nImage -> %s", dest_key, video_dest, image_dest)
                     
-                    os.rename(video_path, video_dest)
-                    os.rename(image_path, image_dest)
+                    move_file(video_path, video_dest)
+                    move_file(image_path, image_dest)
                     
                     # Track moved files
-                    self.moved_files.add(video_path)
+                    moved_files.add(video_path)
                     moved_count += 1
                 
                 # Remove moved files from lists and update index
@@ -498,80 +871,48 @@ class ImageViewer:
                 if self.file_pairs: # Check file_pairs
                     self.show_image(new_index) # Show image at the adjusted index
                 else:
-                    self.label.configure(image='')
-                    self.label.image = None
+                    self.set_photo(None)
                     self.info_label.configure(text="No more images to process")
 
             except Exception as e:
-                logging.error(f"Error moving files: {e}", exc_info=True)
+                logger.error("Error moving files: %s", e, exc_info=True)
                 self.info_label.configure(text=f"Error moving files: {str(e)}")
 
     def cleanup_moved_files(self):
-        """Remove moved files from tracking lists"""
-        """Remove moved files and adjust loaded_images keys."""
-        original_indices = {vp: i for i, (vp, _) in enumerate(self.file_pairs)}
-        indices_to_remove = sorted([
-            original_indices[vp] for vp in self.moved_files if vp in original_indices
-        ], reverse=True)
-
-        if not indices_to_remove:
-            return self.current_index # No changes needed
-
-        logging.debug(f"Indices to remove: {indices_to_remove}")
-
-        # Remove from file_pairs
-        for idx in indices_to_remove:
-            if 0 <= idx < len(self.file_pairs):
-                logging.debug(f"Removing file pair at index {idx}: {self.file_pairs[idx][0]}")
-                del self.file_pairs[idx]
-            else:
-                 logging.warning(f"Attempted to remove out-of-bounds index {idx}")
-
-
-        # Adjust loaded_images dictionary keys
-        new_loaded_images = {}
-        current_new_idx = 0
-        for old_idx in sorted(self.loaded_images.keys()):
-            # Find the original video path for this old index using the original_indices map reverse lookup (less efficient but needed)
-            original_vp = None
-            for vp, oi in original_indices.items():
-                 if oi == old_idx:
-                      original_vp = vp
-                      break
-
-            if original_vp and original_vp not in self.moved_files:
-                # If the file corresponding to old_idx was NOT moved, keep it with the new index
-                new_loaded_images[current_new_idx] = self.loaded_images[old_idx]
-                current_new_idx += 1
-            else:
-                 logging.debug(f"Discarding loaded image data for moved index {old_idx}")
+        """Remove moved files from tracking lists and return the new current index
 
+        One pass over file_pairs keeps the unmoved pairs in order. The new
+        index is that of the first kept pair at or after the old current index.
+        """
+        if not self.moved_files:
+            return self.current_index # No changes needed
 
-        self.loaded_images = new_loaded_images
+        remaining = []
+        moved_images = set()
+        new_current_index = None
+        for old_idx, (video_path, image_path) in enumerate(self.file_pairs):
+            if video_path in self.moved_files:
+                moved_images.add(image_path)
+                continue
+            if new_current_index is None and old_idx >= self.current_index:
+                new_current_index = len(remaining)
+            remaining.append((video_path, image_path))
+
+        # Drop cached images of moved pairs, at every size they were decoded at
+        for key in [key for key in self.image_cache if key[0] in moved_images]:
+            self.uncache_image(key)
+        for key in [key for key in self.photo_cache if key[0] in moved_images]:
+            del self.photo_cache[key]
+
+        logger.debug("Removed %d moved file pairs", len(self.file_pairs) - len(remaining))
+        self.file_pairs = remaining
         self.moved_files.clear() # Clear the set for the next batch
 
-        # Calculate the new current_index
-        # It should be the index of the *first file that was NOT removed* at or after the original current_index
-        new_current_index = 0
-        found_new_index = False
-        temp_idx_map = {vp: i for i, (vp, _) in enumerate(self.file_pairs)} # Map of remaining files to their new indices
-        for old_idx in range(self.current_index, len(original_indices)):
-             original_vp = None
-             for vp, oi in original_indices.items():
-                  if oi == old_idx:
-                       original_vp = vp
-                       break
-             if original_vp in temp_idx_map: # Check if this file still exists
-                  new_current_index = temp_idx_map[original_vp]
-                  found_new_index = True
-                  break
-
-        if not found_new_index:
+        if new_current_index is None:
              # If all files from current onwards were removed, point to the last remaining file or 0
-             new_current_index = max(0, len(self.file_pairs) - 1) if self.file_pairs else 0
+             new_current_index = max(0, len(self.file_pairs) - 1)
 
-
-        logging.debug(f"Cleanup complete. New file_pairs count: {len(self.file_pairs)}. New loaded_images count: {len(self.loaded_images)}. New index: {new_current_index}")
+        logger.debug("Cleanup complete. New file_pairs count: %d. Cached images: %d. New index: %d", len(self.file_pairs), len(self.image_cache), new_current_index)
         return new_current_index
 
 
@@ -579,37 +920,83 @@ class ImageViewer:
         """Play current video in MPC-HC"""
         if 0 <= self.current_index < len(self.file_pairs):
             video_path, _ = self.file_pairs[self.current_index]
-            try:
-                # Attempt to launch MPC-HC with the video file
-                subprocess.Popen([
-                    r"C:\Program Files\MPC-HC\mpc-hc64.exe",
-                    video_path
-                ])
-                logging.info(f"Launched video in MPC-HC: {video_path}")
-            except Exception as e:
-                error_msg = f"Error playing video: {e}"
-                logging.error(error_msg)
+            # Catch the common failure here, where the message can still be
+            # shown; the launch itself runs off the Tk thread
+            if not os.path.isfile(MPC_HC_PATH):
+                error_msg = f"Error playing video: player not found at {MPC_HC_PATH}"
+                logger.error(error_msg)
                 self.info_label.configure(text=error_msg)
+                return
+            # Process creation can take a noticeable moment on Windows
+            threading.Thread(target=launch_player, args=(video_path,),
+                             name="launch-player", daemon=True).start()
 
-def cleanup_empty_dirs(base_path):
-    """Remove empty directories in the given path"""
-    logging.info(f"Cleaning up empty directories in: {base_path}")
+def launch_player(video_path):
+    """Start MPC-HC on video_path, detached; runs on a short-lived thread"""
+    try:
+        subprocess.Popen(
+            [MPC_HC_PATH, video_path],
+            creationflags=PLAYER_POPEN_FLAGS,
+            close_fds=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        logger.info("Launched video in MPC-HC: %s", video_path)
+    except Exception as e:
+        logger.error("Error playing video: %s", e)
+
+def _remove_empty_subdirs(dir_path, skip=()):
+    """Remove empty directories below dir_path, deepest first
+
+    Returns (is_empty, removed): whether dir_path itself is now empty, and
+    how many directories were removed. Emptiness is known from the single
+    scandir listing plus the children's results, so no directory is listed
+    twice. Subdirectories of dir_path named in skip are left untouched and
+    not descended into.
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            subdirs = []
+            has_files = False
+            for entry in entries:
+                if entry.name in skip:
+                    has_files = True # Kept, so dir_path isn't empty
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    has_files = True
+    except OSError as e:
+        logger.error("Error scanning directory %s: %s", dir_path, e)
+        return False, 0
+
+    is_empty = not has_files
     removed = 0
-    
-    for root, dirs, files in os.walk(base_path, topdown=False):
-        for dir_name in dirs:
-            dir_path = os.path.join(root, dir_name)
-            try:
-                # Check if directory is empty (no files and no subdirs)
-                if not os.listdir(dir_path):
-                    os.rmdir(dir_path)
-                    removed += 1
-                    logging.info(f"Removed empty directory: {dir_path}")
-            except Exception as e:
-                logging.error(f"Error removing directory {dir_path}: {e}")
+    for subdir in subdirs:
+        sub_empty, sub_removed = _remove_empty_subdirs(subdir)
+        removed += sub_removed
+        if not sub_empty:
+            is_empty = False
+            continue
+        try:
+            os.rmdir(subdir)
+            removed += 1
+            logger.info("Removed empty directory: %s", subdir)
+        except OSError as e:
+            logger.error("Error removing directory %s: %s", subdir, e)
+            is_empty = False
+    return is_empty, removed
+
+def cleanup_empty_dirs(base_path):
+    """Remove empty directories in the given path
+
+    The keep/ tree only holds sorted output, so it is not walked.
+    """
+    logger.info("Cleaning up empty directories in: %s", base_path)
+    _, removed = _remove_empty_subdirs(base_path, skip=(KEEP_FOLDER,))
     
     if removed > 0:
-        logging.info(f"Removed {removed} empty directories")
+        logger.info("Removed %d empty directories", removed)
     return removed
 
 class FolderSelector:
@@ -692,7 +1079,7 @@ class FolderSelector:
             viewer_window.bind('<Destroy>', self._on_viewer_closed)
             
         except Exception as e:
-            logging.error(f"Error starting viewer: {e}")
+            logger.error("Error starting viewer: %s", e)
             self.status_label.configure(text=f"Error: {str(e)}")
             self.root.deiconify()  # Show selector again on error
 
@@ -705,14 +1092,23 @@ def main():
     """
     Main function to initialize and run the application
     """
+    parser = argparse.ArgumentParser(description="Sort videos by their contact sheets")
+    parser.add_argument('--debug', action='store_true', help="Log debug messages to console and viewer_debug.log")
+    args = parser.parse_args()
+    setup_logging(args.debug)
+
     try:
-        logging.info("Starting application")
+        logger.info("Starting application")
+        log_imaging_backend()
+        # Scanning a large cache can take a moment; don't hold up the window
+        threading.Thread(target=prune_thumbnail_cache, args=(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_BYTES),
+                         name="prune-thumbnails", daemon=True).start()
         root = TkinterDnD.Tk()  # Use TkinterDnD.Tk instead of tk.Tk
         app = FolderSelector(root)
         root.mainloop()
         return 0
     except Exception as e:
-        logging.error("Application error", exc_info=True)
+        logger.error("Application error", exc_info=True)
         return 1
 
 if __name__ == "__main__":
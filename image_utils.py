@@ -1,5 +1,10 @@
 import os
-from PIL import Image, ImageTk
+
+# Supported image formats, lowercase; shared with contact_sheet_manager,
+# which also relies on this order to pick between screens of one video
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+# Same formats as a set, for testing os.path.splitext() output
+IMAGE_EXTENSION_SET = frozenset(IMAGE_EXTENSIONS)
 
 def get_supported_images(folder_path):
     """
@@ -19,16 +24,17 @@ def get_supported_images(folder_path):
     
     Note: Uses case-insensitive extension matching
     """
-    # Define supported image formats
-    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
     images = []
     
     try:
-        # Scan directory for matching files
-        for file in os.listdir(folder_path):
-            if file.lower().endswith(image_extensions):
-                # Build full path and add to list
-                images.append(os.path.join(folder_path, file))
+        # Scan directory for matching files in a single pass; DirEntry
+        # carries the file type and full path, so no extra stat or join.
+        # The name test goes first: it is a set lookup, while is_file()
+        # may need a stat where the OS doesn't report the entry type
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSION_SET and entry.is_file():
+                    images.append(entry.path)
         return sorted(images)  # Sort for consistent ordering
     except Exception as e:
         print(f"Error accessing folder: {e}")
@@ -49,21 +55,19 @@ def calculate_dimensions(original_width, original_height, target_width, target_h
         while maintaining original aspect ratio
         
     Algorithm:
-        1. Calculate aspect ratios of original and target
-        2. Compare ratios to determine limiting dimension
-        3. Scale other dimension proportionally
+        1. Compare aspect ratios to determine limiting dimension
+        2. Scale other dimension proportionally
+        
+    Ratios are compared by cross-multiplying, so everything stays in exact
+    integer arithmetic (no float division or rounding error).
     """
-    # Calculate aspect ratios
-    original_ratio = original_width / original_height
-    new_ratio = target_width / target_height
-    
-    if new_ratio > original_ratio:
+    if target_width * original_height > original_width * target_height:
         # Height is the limiting factor
         new_height = target_height
-        new_width = int(new_height * original_ratio)
+        new_width = (target_height * original_width) // original_height
     else:
         # Width is the limiting factor
         new_width = target_width
-        new_height = int(new_width / original_ratio)
+        new_height = (target_width * original_height) // original_width
     
     return new_width, new_height